@@ -1,5 +1,6 @@
 import os
 
+import xxhash
 from dotenv import load_dotenv
 from supabase import Client, create_client
 
@@ -17,18 +18,24 @@ supabase: Client = (
     create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
 )
 
+def title_digest(title: str) -> int:
+    """64-bit digest used for membership checks against fetch_all_titles()."""
+    return xxhash.xxh64_intdigest(title.lower().encode())
+
+
 def fetch_all_titles():
     """
-    Fetches all verified titles from the database.
-    (Note: For the hackathon demo, this grabs the titles into memory. 
-    For production with 160k titles, we would use Supabase RPCs for pagination).
+    Fetches all verified titles from the database as a set of 64-bit digests.
+
+    Keeping xxh64 digests instead of lowercased strings cuts the in-memory
+    footprint from tens of MB of string objects to ~8 bytes per title at
+    160k rows; callers test membership with title_digest(query).
     """
     try:
         if supabase is None:
             return set()
         response = supabase.table("publications").select("title").execute()
-        # Extract just the title strings into a set
-        return {row['title'].lower() for row in response.data}
+        return {title_digest(row['title']) for row in response.data}
     except Exception as e:
         print(f"Database error: {e}")
         return set()
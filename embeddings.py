@@ -1,23 +1,105 @@
+import asyncio
 import os
-import requests
+from typing import List, Optional
+
+import torch
 from dotenv import load_dotenv
+from sentence_transformers import SentenceTransformer
 
 load_dotenv()
 
-HF_TOKEN = os.getenv("HF_TOKEN")
+MODEL_NAME = os.getenv("EMBEDDING_MODEL", "paraphrase-multilingual-MiniLM-L12-v2")
+BATCH_MAX = 32
+BATCH_WINDOW_SECONDS = 0.005
+
+_encoder: Optional[SentenceTransformer] = None
+_queue: Optional[asyncio.Queue] = None
+_batcher_task: Optional[asyncio.Task] = None
+
+
+def load_encoder() -> SentenceTransformer:
+    global _encoder
+    if _encoder is None:
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        _encoder = SentenceTransformer(MODEL_NAME, device=device)
+    return _encoder
 
-API_URL = "https://api-inference.huggingface.co/models/sentence-transformers/all-MiniLM-L6-v2"
 
-headers = {
-    "Authorization": f"Bearer {HF_TOKEN}"
-}
+async def embed(text: str) -> List[float]:
+    encoder = load_encoder()
+    vector = await asyncio.to_thread(
+        encoder.encode, text, normalize_embeddings=True, convert_to_numpy=True
+    )
+    return vector.tolist()
+
 
-def embed(text: str):
-    response = requests.post(
-        API_URL,
-        headers=headers,
-        json={"inputs": text}
+async def embed_many(texts: List[str], batch_size: int = 64) -> List[List[float]]:
+    encoder = load_encoder()
+    # encode() length-sorts the inputs before chunking into batch_size, so
+    # sub-batches carry near-uniform sequence lengths and minimal padding;
+    # callers must not rely on any ordering of the work internally.
+    vectors = await asyncio.to_thread(
+        encoder.encode,
+        texts,
+        batch_size=batch_size,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
     )
-    if not response.ok:
-        raise Exception(f"Failed to generate embeddings: {response.text}")
-    return response.json()
+    return vectors.tolist()
+
+
+async def _drain_batch(queue: asyncio.Queue) -> List[tuple]:
+    loop = asyncio.get_running_loop()
+    batch = [await queue.get()]
+    deadline = loop.time() + BATCH_WINDOW_SECONDS
+    while len(batch) < BATCH_MAX:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+        except asyncio.TimeoutError:
+            break
+    return batch
+
+
+async def _batch_loop(queue: asyncio.Queue) -> None:
+    while True:
+        batch = await _drain_batch(queue)
+        try:
+            vectors = await embed_many([text for text, _ in batch], batch_size=BATCH_MAX)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            continue
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+
+def start_batcher() -> None:
+    global _queue, _batcher_task
+    if _batcher_task is None or _batcher_task.done():
+        _queue = asyncio.Queue()
+        _batcher_task = asyncio.get_running_loop().create_task(_batch_loop(_queue))
+
+
+async def stop_batcher() -> None:
+    global _queue, _batcher_task
+    if _batcher_task is not None:
+        _batcher_task.cancel()
+        try:
+            await _batcher_task
+        except asyncio.CancelledError:
+            pass
+    _batcher_task = None
+    _queue = None
+
+
+async def embed_queued(text: str) -> List[float]:
+    if _queue is None:
+        return await embed(text)
+    future = asyncio.get_running_loop().create_future()
+    await _queue.put((text, future))
+    return await future
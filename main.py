@@ -1,20 +1,23 @@
+import asyncio
 import os
 from contextlib import asynccontextmanager
-from functools import lru_cache
-from threading import RLock
-from typing import List, Optional, Tuple
+from typing import FrozenSet, List, Optional, Set, Tuple
 
-import jellyfish
+import httpx
+import numpy as np
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from langdetect import LangDetectException, detect
 from pydantic import BaseModel, Field
-from rapidfuzz import fuzz
-from embeddings import embed
+from rapidfuzz import fuzz, process
+from embeddings import embed_queued, load_encoder, start_batcher, stop_batcher
 from supabase import Client, create_client
-from supabase.lib.client_options import SyncClientOptions
 
+from cache import LRUCache
+from scoring import score_and_argmax
 from title_engine import TitleIndex, enforce_guidelines, sanitize_input
 
 
@@ -44,55 +47,85 @@ ENSEMBLE_REJECT_THRESHOLD = _env_float("ENSEMBLE_REJECT_THRESHOLD", 70.0)
 VECTOR_MATCH_THRESHOLD = _env_float("VECTOR_MATCH_THRESHOLD", 0.35)
 VECTOR_MATCH_COUNT = _env_int("VECTOR_MATCH_COUNT", 5)
 SEMANTIC_RPC_TIMEOUT_SECONDS = _env_float("SEMANTIC_RPC_TIMEOUT_SECONDS", 3.0)
+SEMANTIC_ENTER_THRESHOLD = _env_float("SEMANTIC_ENTER_THRESHOLD", 30.0)
+VERIFICATION_CACHE_MAX = _env_int("VERIFICATION_CACHE_MAX", 5000)
+VERIFICATION_CACHE_TTL_SECONDS = _env_float("VERIFICATION_CACHE_TTL_SECONDS", 3600.0)
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-semantic_supabase: Client = create_client(
-    SUPABASE_URL,
-    SUPABASE_KEY,
-    options=SyncClientOptions(postgrest_client_timeout=SEMANTIC_RPC_TIMEOUT_SECONDS),
-)
+pgrst_client: Optional[httpx.AsyncClient] = None
+# Readers capture a reference to the current snapshot without locking; the
+# CPython rebind in the writer path below is atomic. Writers serialize on
+# index_write_lock and publish a copy-on-write snapshot via with_added().
 title_index = TitleIndex()
-index_lock = RLock()
+index_write_lock = asyncio.Lock()
 
+BOOTSTRAP_BATCH_SIZE = 1000
+BOOTSTRAP_CONCURRENCY = 16
+
+
+def _count_titles() -> int:
+    response = (
+        supabase.table("existing_titles")
+        .select("Title", count="exact")
+        .limit(1)
+        .execute()
+    )
+    return response.count or 0
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    print("Bootstrapping in-memory index from Supabase...")
-    batch_size = 1000
-    start = 0
-    loaded = 0
-    while True:
-        response = (
-            supabase.table("existing_titles")
-            .select("Title")
-            .range(start, start + batch_size - 1)
-            .execute()
-        )
-        rows = response.data or []
-        if not rows:
-            break
-
-        batch_titles = [
-            raw_title
-            for row in rows
-            if (raw_title := (row.get("Title") or row.get("title")))
-        ]
 
-        with index_lock:
-            title_index.extend(batch_titles)
-        loaded += len(batch_titles)
+def _fetch_title_rows(start: int, end: int) -> List[dict]:
+    response = (
+        supabase.table("existing_titles").select("Title").range(start, end).execute()
+    )
+    return response.data or []
 
-        start += batch_size
-        if loaded % 10000 == 0:
-            print(f"Indexed {loaded} titles...")
 
-    print(f"Index ready: {loaded} titles.")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global pgrst_client
+    pgrst_client = httpx.AsyncClient(
+        base_url=f"{SUPABASE_URL}/rest/v1",
+        headers={"apikey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}"},
+        http2=True,
+        timeout=SEMANTIC_RPC_TIMEOUT_SECONDS,
+        limits=httpx.Limits(max_keepalive_connections=64),
+    )
+    app.state.pgrst = pgrst_client
+    print("Loading local embedding model...")
+    app.state.encoder = load_encoder()
+    start_batcher()
+    print("Bootstrapping in-memory index from Supabase...")
+    total = await asyncio.to_thread(_count_titles)
+    semaphore = asyncio.Semaphore(BOOTSTRAP_CONCURRENCY)
+
+    async def fetch_range(start: int, end: int) -> List[dict]:
+        async with semaphore:
+            return await asyncio.to_thread(_fetch_title_rows, start, end)
+
+    ranges = [
+        (start, start + BOOTSTRAP_BATCH_SIZE - 1)
+        for start in range(0, total, BOOTSTRAP_BATCH_SIZE)
+    ]
+    batches = await asyncio.gather(*(fetch_range(lo, hi) for lo, hi in ranges))
+    all_titles = [
+        raw_title
+        for rows in batches
+        for row in rows
+        if (raw_title := (row.get("Title") or row.get("title")))
+    ]
+
+    title_index.extend(all_titles)
+
+    print(f"Index ready: {len(all_titles)} titles.")
     yield
-    with index_lock:
-        title_index.clear()
+    await stop_batcher()
+    await pgrst_client.aclose()
+    title_index.clear()
 
 
-app = FastAPI(title="VERIFYXO Engine", lifespan=lifespan)
+app = FastAPI(
+    title="VERIFYXO Engine", lifespan=lifespan, default_response_class=ORJSONResponse
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -155,15 +188,11 @@ def auto_detect_language(text: str) -> str:
         return "English"
 
 
-@lru_cache(maxsize=20000)
-def _cached_metaphone(text: str) -> str:
-    return jellyfish.metaphone(text)
-
-
-def check_combinations_and_phonetics(title: str) -> Tuple[List[str], float, str]:
+def check_combinations_and_phonetics(
+    title: str, index: TitleIndex
+) -> Tuple[List[str], float, str]:
     normalized = sanitize_input(title)
-    with index_lock:
-        reasons, score = title_index.detect_lexical_conflicts(normalized, precleaned=True)
+    reasons, score = index.detect_lexical_conflicts(normalized, precleaned=True)
 
     if reasons and normalized and normalized != title.lower().strip():
         reasons = [f"Input was normalized to '{normalized}' before matching."] + reasons
@@ -189,9 +218,31 @@ def _build_ensemble_reason(
     )
 
 
-@lru_cache(maxsize=5000)
-def cached_verification_logic(title: str, language: str) -> VerificationResponse:
-    lexical_rejections, lexical_score, clean_title = check_combinations_and_phonetics(title)
+verification_cache = LRUCache(
+    maxsize=VERIFICATION_CACHE_MAX, ttl_seconds=VERIFICATION_CACHE_TTL_SECONDS
+)
+
+
+async def cached_verification_logic(title: str, language: str) -> VerificationResponse:
+    cache_key = (sanitize_input(title), language)
+    cached = verification_cache.get(cache_key)
+    if cached is not None:
+        return cached[0]
+
+    response, matched_titles = await _verification_logic(title, language)
+    # Stash the clean title plus every title the ensemble compared against, so
+    # a new submission only evicts the entries it could actually affect.
+    verification_cache.set(cache_key, (response, matched_titles | {cache_key[0]}))
+    return response
+
+
+async def _verification_logic(
+    title: str, language: str
+) -> Tuple[VerificationResponse, FrozenSet[str]]:
+    index = title_index
+    lexical_rejections, lexical_score, clean_title = check_combinations_and_phonetics(
+        title, index
+    )
     if lexical_score >= LEXICAL_REJECT_THRESHOLD:
         probability = max(0.0, 100.0 - lexical_score)
         return VerificationResponse(
@@ -201,10 +252,9 @@ def cached_verification_logic(title: str, language: str) -> VerificationResponse
             is_rejected=True,
             rejection_reasons=lexical_rejections,
             feedback="Title is too close to an existing title by lexical/phonetic checks.",
-        )
+        ), frozenset()
 
-    with index_lock:
-        rule_rejections = enforce_guidelines(clean_title, title_index, precleaned=True)
+    rule_rejections = enforce_guidelines(clean_title, index, precleaned=True)
     if rule_rejections:
         return VerificationResponse(
             status="rejected",
@@ -213,7 +263,7 @@ def cached_verification_logic(title: str, language: str) -> VerificationResponse
             is_rejected=True,
             rejection_reasons=rule_rejections,
             feedback="Title violates PRGI naming guidelines.",
-        )
+        ), frozenset()
 
     if lexical_score >= ENSEMBLE_REJECT_THRESHOLD:
         probability = max(0.0, 100.0 - lexical_score)
@@ -230,66 +280,104 @@ def cached_verification_logic(title: str, language: str) -> VerificationResponse
             is_rejected=True,
             rejection_reasons=reasons,
             feedback="Rejected by lexical scoring without semantic stage.",
-        )
+        ), frozenset()
 
     highest_ensemble_score = 0.0
     ensemble_reasons: List[str] = []
-    try:
-        raw_vector = embed(title)
-        # HuggingFace might return [vector] instead of vector for single string
-        if isinstance(raw_vector, list) and len(raw_vector) > 0 and isinstance(raw_vector[0], list):
-            query_vector = raw_vector[0]
-        else:
-            query_vector = raw_vector
-            
-        rpc_response = semantic_supabase.rpc(
-            "match_titles",
-            {
-                "query_embedding": query_vector,
-                "match_threshold": VECTOR_MATCH_THRESHOLD,
-                "match_count": VECTOR_MATCH_COUNT,
-            },
-        ).execute()
-        matches = rpc_response.data or []
-        seen_matches = set()
-        query_metaphone = _cached_metaphone(clean_title)
-
-        for match in matches:
-            matched_title = match.get("Title") or match.get("title")
-            if not matched_title or matched_title in seen_matches:
-                continue
-            seen_matches.add(matched_title)
-
-            clean_match = sanitize_input(matched_title)
-            if not clean_match:
-                continue
-            semantic_score = max(0.0, min(100.0, float(match.get("similarity", 0)) * 100.0))
-            phonetic_score = 0.0
-            if query_metaphone and query_metaphone == _cached_metaphone(clean_match):
-                phonetic_score = 100.0
-            fuzzy_score = float(fuzz.ratio(clean_title, clean_match))
-
-            total_similarity = (
-                (0.40 * semantic_score)
-                + (0.35 * phonetic_score)
-                + (0.25 * fuzzy_score)
+    matched_clean_titles: Set[str] = set()
+
+    # Partial evaluation of the ensemble blend: semantic and phonetic are
+    # capped at 100, so the weighted total cannot clear the threshold when
+    # the fuzzy term is too small, and titles with almost no lexical overlap
+    # gain nothing from the vector round trip.
+    max_possible_ensemble = 0.40 * 100.0 + 0.35 * 100.0 + 0.25 * lexical_score
+    run_semantic = (
+        lexical_score >= SEMANTIC_ENTER_THRESHOLD
+        and max_possible_ensemble >= ENSEMBLE_REJECT_THRESHOLD
+    )
+
+    if run_semantic:
+        try:
+            query_vector = await embed_queued(title)
+            # orjson serializes the 384-float vector in C instead of the
+            # per-element pure-Python json path.
+            rpc_response = await pgrst_client.post(
+                "/rpc/match_titles",
+                content=orjson.dumps(
+                    {
+                        "query_embedding": query_vector,
+                        "match_threshold": VECTOR_MATCH_THRESHOLD,
+                        "match_count": VECTOR_MATCH_COUNT,
+                    }
+                ),
+                headers={"Content-Type": "application/json"},
             )
-            highest_ensemble_score = max(highest_ensemble_score, total_similarity)
-
-            if total_similarity >= ENSEMBLE_REJECT_THRESHOLD:
-                ensemble_reasons.append(
-                    _build_ensemble_reason(
-                        matched_title=matched_title,
-                        total_similarity=total_similarity,
-                        semantic_score=semantic_score,
-                        phonetic_score=phonetic_score,
-                        fuzzy_score=fuzzy_score,
-                    )
+            rpc_response.raise_for_status()
+            matches = orjson.loads(rpc_response.content) if rpc_response.content else []
+            seen_matches = set()
+            unique_matches = []
+            for match in matches:
+                matched_title = match.get("Title") or match.get("title")
+                if not matched_title or matched_title in seen_matches:
+                    continue
+                seen_matches.add(matched_title)
+
+                clean_match = sanitize_input(matched_title)
+                if not clean_match:
+                    continue
+                matched_clean_titles.add(clean_match)
+                unique_matches.append((match, matched_title, clean_match))
+
+            query_metaphone = index.metaphone_for(clean_title)
+            if unique_matches:
+                count = len(unique_matches)
+                # One C-level pass over all matches instead of a fuzz.ratio per row.
+                fuzzy = process.cdist(
+                    [clean_title],
+                    [clean_match for _, _, clean_match in unique_matches],
+                    scorer=fuzz.ratio,
+                    workers=-1,
+                    dtype=np.float32,
+                )[0]
+                semantic = np.fromiter(
+                    (
+                        float(match.get("similarity", 0)) * 100.0
+                        for match, _, _ in unique_matches
+                    ),
+                    dtype=np.float32,
+                    count=count,
+                )
+                np.clip(semantic, 0.0, 100.0, out=semantic)
+                phonetic = np.fromiter(
+                    (
+                        100.0
+                        if query_metaphone
+                        and query_metaphone == index.metaphone_for(clean_match)
+                        else 0.0
+                        for _, _, clean_match in unique_matches
+                    ),
+                    dtype=np.float32,
+                    count=count,
                 )
-                break
 
-    except Exception as exc:
-        print(f"Semantic RPC failed, continuing without vector stage: {exc}")
+                best_idx, highest_ensemble_score = score_and_argmax(
+                    semantic, phonetic, fuzzy
+                )
+
+                if highest_ensemble_score >= ENSEMBLE_REJECT_THRESHOLD:
+                    _, matched_title, _ = unique_matches[best_idx]
+                    ensemble_reasons.append(
+                        _build_ensemble_reason(
+                            matched_title=matched_title,
+                            total_similarity=highest_ensemble_score,
+                            semantic_score=float(semantic[best_idx]),
+                            phonetic_score=float(phonetic[best_idx]),
+                            fuzzy_score=float(fuzzy[best_idx]),
+                        )
+                    )
+
+        except Exception as exc:
+            print(f"Semantic RPC failed, continuing without vector stage: {exc}")
 
     final_similarity = max(lexical_score, highest_ensemble_score)
     probability = max(0.0, 100.0 - final_similarity)
@@ -305,7 +393,7 @@ def cached_verification_logic(title: str, language: str) -> VerificationResponse
             is_rejected=True,
             rejection_reasons=reasons,
             feedback="Rejected by weighted lexical, phonetic, and semantic scoring.",
-        )
+        ), frozenset(matched_clean_titles)
 
     return VerificationResponse(
         status="success",
@@ -314,49 +402,61 @@ def cached_verification_logic(title: str, language: str) -> VerificationResponse
         is_rejected=False,
         rejection_reasons=[],
         feedback="Title passed automated validation checks.",
-    )
+    ), frozenset(matched_clean_titles)
 
 
 @app.get("/healthz")
 async def healthz():
-    with index_lock:
-        total_titles = len(title_index.existing_titles)
-    return {"status": "ok", "indexed_titles": total_titles}
+    return {"status": "ok", "indexed_titles": title_index.title_count}
 
 
 @app.post("/verify", response_model=VerificationResponse)
 async def verify_new_title(submission: TitleSubmission):
     if not submission.language:
         submission.language = auto_detect_language(submission.title)
-    return cached_verification_logic(submission.title, submission.language)
+    return await cached_verification_logic(submission.title, submission.language)
 
 
 @app.post("/submit_application")
 async def submit_application(app_data: OfficialApplication):
+    global title_index
     clean_title = sanitize_input(app_data.title)
     if not clean_title:
         raise HTTPException(status_code=400, detail="Title cannot be empty.")
 
-    with index_lock:
+    async with index_write_lock:
         if clean_title in title_index.existing_titles:
             raise HTTPException(status_code=409, detail="Title already exists.")
 
-    try:
-        supabase.table("existing_titles").insert(
-            {
-                "Title": app_data.title,
-                "Language": app_data.language,
-                "Publication State": "pending",
-            }
-        ).execute()
-    except Exception as exc:
-        raise HTTPException(
-            status_code=500, detail=f"Failed to persist application: {exc}"
-        ) from exc
+        try:
+            # Single round trip: INSERT ... ON CONFLICT DO NOTHING via
+            # PostgREST; a duplicate comes back as an empty representation.
+            response = (
+                supabase.table("existing_titles")
+                .upsert(
+                    {
+                        "Title": app_data.title,
+                        "Language": app_data.language,
+                        "Publication State": "pending",
+                    },
+                    on_conflict="Title",
+                    ignore_duplicates=True,
+                )
+                .execute()
+            )
+        except Exception as exc:
+            raise HTTPException(
+                status_code=500, detail=f"Failed to persist application: {exc}"
+            ) from exc
+
+        if not response.data:
+            raise HTTPException(status_code=409, detail="Title already exists.")
 
-    with index_lock:
-        title_index.add_title(app_data.title)
-    cached_verification_logic.cache_clear()
+        title_index = title_index.with_added(app_data.title)
+
+    verification_cache.invalidate_where(
+        lambda value: clean_title in value[1]
+    )
     return {"status": "success", "message": "Official application submitted to PRGI."}
 
 
@@ -0,0 +1,82 @@
+"""Compiled scoring kernels for the verification hot path.
+
+Compiled with numba when available; falls back to plain NumPy so the
+service still runs in environments without a JIT toolchain. Ensemble
+weights must stay in sync with _build_ensemble_reason in main.py.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is optional
+    njit = None
+
+SEMANTIC_WEIGHT = 0.40
+PHONETIC_WEIGHT = 0.35
+FUZZY_WEIGHT = 0.25
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _kernel(semantic, phonetic, fuzzy):  # pragma: no cover - compiled
+        best = 0.0
+        best_idx = -1
+        for i in range(semantic.shape[0]):
+            total = 0.40 * semantic[i] + 0.35 * phonetic[i] + 0.25 * fuzzy[i]
+            if best_idx < 0 or total > best:
+                best = total
+                best_idx = i
+        return best_idx, best
+
+
+    @njit(cache=True)
+    def _accumulate_kernel(scores, ids, offsets, weights):  # pragma: no cover
+        for seg in range(offsets.shape[0] - 1):
+            weight = weights[seg]
+            for i in range(offsets[seg], offsets[seg + 1]):
+                scores[ids[i]] += weight
+
+
+def accumulate_postings(
+    scores: np.ndarray, postings: List[np.ndarray], weights: List[int]
+) -> None:
+    """Scatter-add each posting list into scores with its segment weight.
+
+    Posting lists are concatenated into a CSR-style (ids, offsets) pair so
+    the jitted kernel runs one tight loop over all segments. The scatter is
+    serial on purpose: overlapping candidate IDs make a parallel version
+    racy.
+    """
+    if not postings:
+        return
+    if njit is None:
+        for ids, weight in zip(postings, weights):
+            scores[ids] += weight
+        return
+
+    offsets = np.zeros(len(postings) + 1, dtype=np.int64)
+    np.cumsum([len(ids) for ids in postings], out=offsets[1:])
+    _accumulate_kernel(
+        scores,
+        np.concatenate(postings),
+        offsets,
+        np.asarray(weights, dtype=scores.dtype),
+    )
+
+
+def score_and_argmax(
+    semantic: np.ndarray, phonetic: np.ndarray, fuzzy: np.ndarray
+) -> Tuple[int, float]:
+    """Return (index, score) of the highest weighted blend across matches."""
+    if njit is not None:
+        best_idx, best = _kernel(semantic, phonetic, fuzzy)
+        return int(best_idx), float(best)
+
+    totals = (
+        SEMANTIC_WEIGHT * semantic + PHONETIC_WEIGHT * phonetic + FUZZY_WEIGHT * fuzzy
+    )
+    best_idx = int(totals.argmax())
+    return best_idx, float(totals[best_idx])
@@ -1,7 +1,9 @@
+import asyncio
 import os
 
+import numpy as np
 from dotenv import load_dotenv
-from embeddings import embed
+from embeddings import embed_many
 from supabase import Client, create_client
 
 # 1. Setup Environment
@@ -14,45 +16,79 @@ if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 
-def generate_and_upload_embeddings():
+UPLOAD_CONCURRENCY = 8
+UPLOAD_CHUNK_SIZE = 64
+
+
+def _fetch_batch(last_id: int, batch_size: int):
+    # Keyset pagination on id: uploads of the previous batch may still be in
+    # flight, so filtering on "embedding_h is null" alone could refetch rows.
+    return (
+        supabase.table("existing_titles")
+        .select("id, Title")
+        .is_("embedding_h", "null")
+        .gt("id", last_id)
+        .order("id")
+        .limit(batch_size)
+        .execute()
+    )
+
+
+def _upsert_chunk(chunk):
+    supabase.table("existing_titles").upsert(chunk).execute()
+
+
+async def generate_and_upload_embeddings():
     batch_size = 500
     processed_count = 0
-    
+    last_id = 0
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+    pending = []
+
+    async def upload_chunk(chunk):
+        async with semaphore:
+            await asyncio.to_thread(_upsert_chunk, chunk)
+
     print("Starting vector generation for 77,000 records...")
-    
+
     while True:
-        # Fetch a batch of titles that don't have an embedding yet
-        # Adjust 'Title' if your friend used lowercase 'title' in the DB column
-        response = supabase.table("existing_titles") \
-            .select("id, Title") \
-            .is_("embedding", "null") \
-            .limit(batch_size) \
-            .execute()
-            
+        response = await asyncio.to_thread(_fetch_batch, last_id, batch_size)
         records = response.data
         if not records:
-            print(f"🎉 Complete! Processed a total of {processed_count} records.")
             break
-            
+
         print(f"Processing batch of {len(records)} records...")
-        
+        last_id = records[-1]["id"]
+
         titles = [record["Title"] for record in records]
-        raw_vectors = embed(titles)
-        # In case API returns list of lists or something nested strangely
-        if isinstance(raw_vectors, dict):
-            print(f"Error from HF API: {raw_vectors}")
-            break
-        vectors = raw_vectors
+        # Round to fp16 before upload; the column is halfvec(384).
+        vectors = np.asarray(await embed_many(titles), dtype=np.float16)
 
-        # Batch upsert is significantly faster than row-by-row updates.
         updates = [
-            {"id": record["id"], "embedding": vector}
-            for record, vector in zip(records, vectors)
+            {"id": record["id"], "embedding_h": vector}
+            for record, vector in zip(records, vectors.tolist())
         ]
-        supabase.table("existing_titles").upsert(updates).execute()
-        processed_count += len(updates)
 
+        # Fire the uploads in parallel chunks and keep encoding the next batch
+        # while they run; the semaphore caps in-flight requests.
+        for start in range(0, len(updates), UPLOAD_CHUNK_SIZE):
+            pending.append(
+                asyncio.create_task(upload_chunk(updates[start:start + UPLOAD_CHUNK_SIZE]))
+            )
+        still_pending = []
+        for task in pending:
+            if task.done():
+                task.result()  # surface upload failures instead of dropping them
+            else:
+                still_pending.append(task)
+        pending = still_pending
+
+        processed_count += len(updates)
         print(f"Embedded {processed_count} titles so far...")
 
+    if pending:
+        await asyncio.gather(*pending)
+    print(f"🎉 Complete! Processed a total of {processed_count} records.")
+
 if __name__ == "__main__":
-    generate_and_upload_embeddings()
+    asyncio.run(generate_and_upload_embeddings())
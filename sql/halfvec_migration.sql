@@ -0,0 +1,32 @@
+-- Store embeddings as halfvec (fp16) instead of float32 vector.
+-- Requires pgvector >= 0.7. Halves the bytes scanned per distance
+-- computation and doubles the effective SIMD width in pgvector's kernels.
+
+ALTER TABLE existing_titles ADD COLUMN IF NOT EXISTS embedding_h halfvec(384);
+
+UPDATE existing_titles
+SET embedding_h = embedding::halfvec(384)
+WHERE embedding IS NOT NULL AND embedding_h IS NULL;
+
+-- Rebuild match_titles against the halfvec column. The old vector-typed
+-- overload must go first: CREATE OR REPLACE with a different argument
+-- type adds a second overload, and PostgREST then rejects every
+-- /rpc/match_titles call as ambiguous.
+DROP FUNCTION IF EXISTS match_titles(vector(384), float, int);
+
+CREATE OR REPLACE FUNCTION match_titles(
+    query_embedding halfvec(384),
+    match_threshold float,
+    match_count int
+)
+RETURNS TABLE ("Title" text, similarity float)
+LANGUAGE sql STABLE AS $$
+    SELECT
+        et."Title",
+        1 - (et.embedding_h <=> query_embedding) AS similarity
+    FROM existing_titles et
+    WHERE et.embedding_h IS NOT NULL
+      AND 1 - (et.embedding_h <=> query_embedding) > match_threshold
+    ORDER BY et.embedding_h <=> query_embedding
+    LIMIT match_count;
+$$;
@@ -0,0 +1,29 @@
+-- Approximate-nearest-neighbour index for match_titles. Without it the
+-- RPC falls back to a sequential (or IVFFlat) scan over every stored
+-- vector; HNSW reduces the candidates touched to O(log N).
+
+CREATE INDEX IF NOT EXISTS existing_titles_embedding_h_hnsw
+ON existing_titles
+USING hnsw (embedding_h halfvec_cosine_ops)
+WITH (m = 16, ef_construction = 64);
+
+-- Re-create match_titles with ef_search pinned for the function's
+-- execution; ORDER BY on the <=> operator lets the planner use HNSW.
+CREATE OR REPLACE FUNCTION match_titles(
+    query_embedding halfvec(384),
+    match_threshold float,
+    match_count int
+)
+RETURNS TABLE ("Title" text, similarity float)
+LANGUAGE sql STABLE
+SET hnsw.ef_search = 40
+AS $$
+    SELECT
+        et."Title",
+        1 - (et.embedding_h <=> query_embedding) AS similarity
+    FROM existing_titles et
+    WHERE et.embedding_h IS NOT NULL
+      AND 1 - (et.embedding_h <=> query_embedding) > match_threshold
+    ORDER BY et.embedding_h <=> query_embedding
+    LIMIT match_count;
+$$;
@@ -0,0 +1,6 @@
+-- Backs the ignore-duplicates upsert in /submit_application: PostgREST's
+-- on_conflict needs a unique constraint on the raw column. Case/spelling
+-- variants are still caught by the in-memory sanitized-title check.
+
+CREATE UNIQUE INDEX IF NOT EXISTS existing_titles_title_key
+ON existing_titles ("Title");
@@ -0,0 +1,37 @@
+from cache import LRUCache
+
+
+def test_get_set_roundtrip():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_expiry():
+    cache = LRUCache(maxsize=2, ttl_seconds=-1.0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_invalidate_where():
+    cache = LRUCache(maxsize=4)
+    cache.set("a", {"x"})
+    cache.set("b", {"y"})
+    removed = cache.invalidate_where(lambda value: "x" in value)
+
+    assert removed == 1
+    assert cache.get("a") is None
+    assert cache.get("b") == {"y"}
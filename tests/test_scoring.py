@@ -0,0 +1,34 @@
+import numpy as np
+
+from scoring import accumulate_postings, score_and_argmax
+
+
+def test_accumulate_postings_applies_segment_weights():
+    scores = np.zeros(5, dtype=np.int16)
+    postings = [
+        np.array([0, 2, 4], dtype=np.int64),
+        np.array([2, 3], dtype=np.int64),
+    ]
+
+    accumulate_postings(scores, postings, [3, 1])
+
+    assert scores.tolist() == [3, 0, 4, 1, 3]
+
+
+def test_picks_highest_weighted_blend():
+    semantic = np.array([10.0, 90.0, 50.0], dtype=np.float32)
+    phonetic = np.array([0.0, 100.0, 0.0], dtype=np.float32)
+    fuzzy = np.array([20.0, 80.0, 40.0], dtype=np.float32)
+
+    best_idx, best = score_and_argmax(semantic, phonetic, fuzzy)
+
+    assert best_idx == 1
+    assert abs(best - (0.40 * 90.0 + 0.35 * 100.0 + 0.25 * 80.0)) < 1e-3
+
+
+def test_single_match():
+    one = np.array([50.0], dtype=np.float32)
+    best_idx, best = score_and_argmax(one, one, one)
+
+    assert best_idx == 0
+    assert abs(best - 50.0) < 1e-3
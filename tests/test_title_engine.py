@@ -6,6 +6,16 @@ def test_sanitize_input_normalizes_and_romanizes():
     assert "desh" in sanitize_input("देश की आवाज")
 
 
+def test_existing_titles_supports_constant_time_membership():
+    index = TitleIndex()
+    index.add_title("Indian-Express")
+
+    # /submit_application relies on hashed membership of sanitized titles;
+    # the container must stay a set, not degrade to a list scan.
+    assert isinstance(index.existing_titles, set)
+    assert "indian express" in index.existing_titles
+
+
 def test_exact_match_conflict():
     index = TitleIndex()
     index.add_title("Indian Express")
@@ -43,6 +53,36 @@ def test_title_combination_conflict():
     assert "combine existing titles" in reasons[0]
 
 
+def test_short_query_matches_title_containing_it():
+    index = TitleIndex()
+    index.add_title("NDTV")
+
+    # A short query's degenerate gram must still probe the trigram index:
+    # "ndt" only reaches "ndtv" as a substring match, not via tokens.
+    reasons, score = index.detect_lexical_conflicts("ndt")
+    assert score >= 80.0
+    assert "too close to existing title" in reasons[0]
+
+
+def test_with_added_leaves_previous_snapshot_untouched():
+    index = TitleIndex()
+    index.add_title("Indian Express")
+
+    newer = index.with_added("Express Herald")
+
+    assert "express herald" in newer.existing_titles
+    assert "express herald" not in index.existing_titles
+    # Shared bucket for the common token must not be mutated in the old snapshot.
+    assert all(
+        "herald" not in index._titles[title_id]
+        for title_id in index.token_index["express"]
+    )
+
+    reasons, score = newer.detect_lexical_conflicts("Express Herald")
+    assert score == 100.0
+    assert "Exact match" in reasons[0]
+
+
 def test_guidelines_disallowed_words():
     index = TitleIndex()
     reasons = enforce_guidelines("National Crime Bulletin", index)
@@ -1,19 +1,24 @@
 from __future__ import annotations
 
-import re
-from collections import Counter, defaultdict
+import os
+from array import array
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from functools import lru_cache
-from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 import jellyfish
-from rapidfuzz import fuzz
+import numpy as np
+from pyroaring import BitMap
+from rapidfuzz import fuzz, process
 from unidecode import unidecode
 
+from scoring import accumulate_postings
+
 LEET_MAP = str.maketrans("0134578@!", "oieastbba")
-DISALLOWED_WORDS = {"police", "crime", "corruption", "cbi", "cid", "army"}
-PREFIXES_SUFFIXES = {"the", "india", "samachar", "news"}
-ADVANCED_PERIODICITY = {
+DISALLOWED_WORDS = frozenset({"police", "crime", "corruption", "cbi", "cid", "army"})
+PREFIXES_SUFFIXES = frozenset({"the", "india", "samachar", "news"})
+ADVANCED_PERIODICITY = frozenset({
     "daily",
     "weekly",
     "monthly",
@@ -25,57 +30,180 @@ ADVANCED_PERIODICITY = {
     "varshik",
     "pratidin",
     "rozana",
-}
+})
+# Union checked first so clean titles pay a single set intersection.
+_FLAGGED_WORDS = DISALLOWED_WORDS | ADVANCED_PERIODICITY
 
-WHITESPACE_RE = re.compile(r"\s+")
-NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]")
+def _build_clean_table() -> bytes:
+    """One 256-entry byte table folding lowercase, leet mapping, and
+    non-alphanumeric-to-space into a single translate pass."""
+    table = bytearray(256)
+    for byte in range(256):
+        if byte in LEET_MAP:
+            table[byte] = LEET_MAP[byte]
+        elif 0x61 <= byte <= 0x7A or byte in b"0123456789":
+            table[byte] = byte
+        elif 0x41 <= byte <= 0x5A:
+            table[byte] = byte + 0x20
+        else:
+            table[byte] = 0x20
+    return bytes(table)
 
 
-@lru_cache(maxsize=200000)
-def _sanitize_cached(title: str) -> str:
-    romanized_title = unidecode(title)
-    de_leeted = romanized_title.lower().translate(LEET_MAP)
-    cleaned = NON_ALNUM_RE.sub(" ", de_leeted)
-    return WHITESPACE_RE.sub(" ", cleaned).strip()
+_CLEAN_TABLE = _build_clean_table()
 
 
-@lru_cache(maxsize=200000)
-def _metaphone_cached(text: str) -> str:
-    return jellyfish.metaphone(text)
+_SANITIZE_CACHE_MAX = 200000
+_CONFLICT_CACHE_MAX = 50000
+_sanitize_cache: Dict[str, str] = {}
 
 
-@lru_cache(maxsize=200000)
-def _compact_ngrams_cached(compact: str, n: int) -> FrozenSet[str]:
-    if not compact:
-        return frozenset()
-    if len(compact) <= n:
-        return frozenset({compact})
-    return frozenset(compact[i : i + n] for i in range(len(compact) - n + 1))
+def _sanitize(title: str) -> str:
+    # unidecode output is ASCII, so the rest of the cleanup runs on bytes:
+    # one translate pass plus a whitespace-collapsing split/join, instead of
+    # lower + translate + two regex substitutions over the string.
+    cleaned = unidecode(title).encode("ascii", "ignore").translate(_CLEAN_TABLE)
+    return b" ".join(cleaned.split()).decode("ascii")
 
 
-def sanitize_input(title: str) -> str:
-    return _sanitize_cached(title or "")
+_metaphone_cache: Dict[str, str] = {}
+
+
+def _metaphone_cached(text: str) -> str:
+    # Bounded like _sanitize_cache: queries feed this with unbounded
+    # cardinality, so an uncapped memo would grow forever.
+    cached = _metaphone_cache.get(text)
+    if cached is None:
+        cached = jellyfish.metaphone(text)
+        if len(_metaphone_cache) >= _SANITIZE_CACHE_MAX:
+            _metaphone_cache.pop(next(iter(_metaphone_cache)))
+        _metaphone_cache[text] = cached
+    return cached
 
 
-def char_ngrams(text: str, n: int = 3) -> FrozenSet[str]:
+def sanitize_input(title: str) -> str:
+    title = title or ""
+    cached = _sanitize_cache.get(title)
+    if cached is None:
+        cached = _sanitize(title)
+        if len(_sanitize_cache) >= _SANITIZE_CACHE_MAX:
+            # Plain FIFO eviction: title frequency is Zipfian, so a hot entry
+            # that gets dropped is re-inserted on its next (immediate) use,
+            # without lru_cache's per-hit linked-list bookkeeping.
+            _sanitize_cache.pop(next(iter(_sanitize_cache)))
+        _sanitize_cache[title] = cached
+    return cached
+
+
+def _sanitize_batch(titles: List[str]) -> List[str]:
+    # Bulk loads are overwhelmingly unique strings; probing and evicting
+    # the FIFO cache per item would only churn out hot query entries.
+    return [_sanitize(title or "") for title in titles]
+
+
+def _metaphone_batch(sanitized: List[str]) -> List[str]:
+    # jellyfish's metaphone is a C call that releases the GIL, so bulk
+    # loads compute all codes across cores.
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(executor.map(jellyfish.metaphone, sanitized, chunksize=1000))
+
+
+_fused_cache: Dict[str, Tuple[str, str]] = {}
+
+
+def sanitize_and_meta(title: str) -> Tuple[str, str]:
+    """Return (normalized, metaphone) for a raw title in one cache probe.
+
+    Indexing needs both forms for every title, so fusing them behind a
+    single FIFO cache keyed by the raw string saves the second dict lookup
+    and call on the hot path.
+    """
+    title = title or ""
+    cached = _fused_cache.get(title)
+    if cached is None:
+        clean = sanitize_input(title)
+        cached = (clean, _metaphone_cached(clean) if clean else "")
+        if len(_fused_cache) >= _SANITIZE_CACHE_MAX:
+            _fused_cache.pop(next(iter(_fused_cache)))
+        _fused_cache[title] = cached
+    return cached
+
+
+def char_ngrams(text: str, n: int = 3) -> Tuple[str, ...]:
+    # Built inline rather than memoized: the tuple is cheaper to produce
+    # than an lru_cache hit is to serve, and callers only iterate it once.
+    # dict.fromkeys dedupes so repeated grams cannot double-count.
     compact = text.replace(" ", "")
-    return _compact_ngrams_cached(compact, n)
+    if not compact:
+        return ()
+    if len(compact) <= n:
+        return (compact,)
+    return tuple(
+        dict.fromkeys(compact[i : i + n] for i in range(len(compact) - n + 1))
+    )
 
 
 def make_acronym(words: List[str]) -> str:
     return "".join(word[0] for word in words if word)
 
 
+def _char_slot(char: str) -> int:
+    """Map a normalized first character ([a-z0-9]) to its bucket slot."""
+    code = ord(char)
+    return code - 97 if code >= 97 else 26 + code - 48
+
+
+def pack_acronym(acronym: str) -> int:
+    """Pack an acronym of up to 8 ASCII chars into a u64 map key."""
+    return int.from_bytes(acronym.encode("ascii").ljust(8, b"\0"), "little")
+
+
 @dataclass
 class TitleIndex:
+    """In-memory lexical index.
+
+    Posting maps hold integer title IDs rather than normalized strings:
+    an ID is 8 bytes to hash and compare, where repeated full-title keys
+    cost ~50 bytes each and wreck cache locality on long posting lists.
+    _titles resolves an ID back to its normalized form.
+    """
+
+    # Caps on how many query tokens/trigrams contribute to candidate scoring;
+    # processed rarest-first, so common grams with huge postings are the ones
+    # dropped when a query exceeds the budget.
+    MAX_QUERY_TOKENS = 32
+    MAX_QUERY_TRIGRAMS = 64
+
     existing_titles: Set[str] = field(default_factory=set)
     canonical_titles: Dict[str, Set[str]] = field(default_factory=lambda: defaultdict(set))
-    phonetic_map: Dict[str, Set[str]] = field(default_factory=lambda: defaultdict(set))
-    sorted_titles_map: Dict[str, Set[str]] = field(default_factory=lambda: defaultdict(set))
-    acronym_map: Dict[str, Set[str]] = field(default_factory=lambda: defaultdict(set))
-    token_index: Dict[str, Set[str]] = field(default_factory=lambda: defaultdict(set))
-    trigram_index: Dict[str, Set[str]] = field(default_factory=lambda: defaultdict(set))
-    first_char_index: Dict[str, Set[str]] = field(default_factory=lambda: defaultdict(set))
+    phonetic_map: Dict[str, Set[int]] = field(default_factory=lambda: defaultdict(set))
+    # Keyed by packed integers instead of rebuilt strings: a tuple of sorted
+    # word IDs for word-order lookups, a u64 for acronyms.
+    sorted_titles_map: Dict[Tuple[int, ...], Set[int]] = field(
+        default_factory=lambda: defaultdict(set)
+    )
+    acronym_map: Dict[int, Set[int]] = field(default_factory=lambda: defaultdict(set))
+    _word_ids: Dict[str, int] = field(default_factory=dict)
+    # Every indexed title as its tuple of word IDs, so substring probes can
+    # hash small int tuples instead of re-joining strings.
+    _title_tuples: Set[Tuple[int, ...]] = field(default_factory=set)
+    # Token/trigram postings carry the longest lists, so they use roaring
+    # bitmaps: compressed storage plus native-code set operations.
+    token_index: Dict[str, BitMap] = field(default_factory=dict)
+    trigram_index: Dict[str, BitMap] = field(default_factory=dict)
+    # Normalized titles only start with [a-z0-9], so first-char buckets live
+    # in a fixed 36-slot list addressed by arithmetic instead of hashing.
+    first_char_index: List[Set[int]] = field(
+        default_factory=lambda: [set() for _ in range(36)]
+    )
+    _titles: List[str] = field(default_factory=list)
+    _title_ids: Dict[str, int] = field(default_factory=dict)
+    # Parallel per-ID arrays derived once at add time (SoA layout).
+    meta_by_id: List[str] = field(default_factory=list)
+    len_by_id: array = field(default_factory=lambda: array("I"))
+    # Per-snapshot memo of conflict results; cleared whenever the index
+    # mutates and never shared across with_added() copies.
+    _conflict_cache: Dict[str, Tuple[List[str], float]] = field(default_factory=dict)
 
     def clear(self) -> None:
         self.existing_titles.clear()
@@ -85,94 +213,245 @@ class TitleIndex:
         self.acronym_map.clear()
         self.token_index.clear()
         self.trigram_index.clear()
-        self.first_char_index.clear()
-
-    def add_title(self, raw_title: str) -> None:
-        normalized = sanitize_input(raw_title)
+        self.first_char_index[:] = [set() for _ in range(36)]
+        self._titles.clear()
+        self._title_ids.clear()
+        self._word_ids.clear()
+        self._title_tuples.clear()
+        del self.meta_by_id[:]
+        del self.len_by_id[:]
+        self._conflict_cache.clear()
+
+    @staticmethod
+    def _bucket(mapping: Dict, key, copy: bool, factory=set):
+        bucket = mapping.get(key)
+        if bucket is None:
+            bucket = mapping[key] = factory()
+        elif copy:
+            bucket = mapping[key] = factory(bucket)
+        return bucket
+
+    def add_title(
+        self,
+        raw_title: str,
+        *,
+        _copy_buckets: bool = False,
+        _metaphone: Optional[str] = None,
+        _normalized: Optional[str] = None,
+    ) -> None:
+        if _normalized is not None:
+            normalized = _normalized
+        elif _metaphone is None:
+            normalized, _metaphone = sanitize_and_meta(raw_title)
+        else:
+            normalized = sanitize_input(raw_title)
         if not normalized:
             return
+        if _metaphone is None:
+            _metaphone = _metaphone_cached(normalized)
 
-        words = normalized.split()
+        self._conflict_cache.clear()
         self.existing_titles.add(normalized)
-        self.canonical_titles[normalized].add(raw_title.strip())
+        self._bucket(self.canonical_titles, normalized, _copy_buckets).add(raw_title.strip())
 
-        metaphone = _metaphone_cached(normalized)
+        title_id = self._title_ids.get(normalized)
+        if title_id is not None:
+            # Already indexed; only the canonical spelling variant was new.
+            return
+        title_id = len(self._titles)
+        self._title_ids[normalized] = title_id
+        self._titles.append(normalized)
+
+        words = normalized.split()
+        metaphone = _metaphone
+        self.meta_by_id.append(metaphone)
+        self.len_by_id.append(len(normalized))
         if metaphone:
-            self.phonetic_map[metaphone].add(normalized)
+            self._bucket(self.phonetic_map, metaphone, _copy_buckets).add(title_id)
+
+        word_ids = self._word_ids
+        id_tuple = tuple(word_ids.setdefault(word, len(word_ids)) for word in words)
+        self._title_tuples.add(id_tuple)
 
         if len(words) > 1:
-            sorted_key = " ".join(sorted(words))
-            self.sorted_titles_map[sorted_key].add(normalized)
+            sorted_key = tuple(sorted(id_tuple))
+            self._bucket(self.sorted_titles_map, sorted_key, _copy_buckets).add(title_id)
             acronym = make_acronym(words)
-            if acronym:
-                self.acronym_map[acronym].add(normalized)
+            # Longer acronyms can never match: the lookup side is gated on
+            # queries of at most 8 characters.
+            if acronym and len(acronym) <= 8:
+                self._bucket(
+                    self.acronym_map, pack_acronym(acronym), _copy_buckets
+                ).add(title_id)
 
         for token in set(words):
-            self.token_index[token].add(normalized)
+            self._bucket(self.token_index, token, _copy_buckets, BitMap).add(title_id)
 
         for gram in char_ngrams(normalized):
-            self.trigram_index[gram].add(normalized)
-
-        if normalized:
-            self.first_char_index[normalized[0]].add(normalized)
+            self._bucket(self.trigram_index, gram, _copy_buckets, BitMap).add(title_id)
+
+        slot = _char_slot(normalized[0])
+        bucket = self.first_char_index[slot]
+        if _copy_buckets:
+            bucket = self.first_char_index[slot] = set(bucket)
+        bucket.add(title_id)
+
+    def with_added(self, raw_title: str) -> "TitleIndex":
+        """Return a new index containing raw_title.
+
+        Top-level containers are copied and only the buckets touched by the
+        new title are duplicated, so readers holding the previous snapshot
+        never observe a mutation.
+        """
+        clone = TitleIndex(
+            existing_titles=set(self.existing_titles),
+            canonical_titles=defaultdict(set, self.canonical_titles),
+            phonetic_map=defaultdict(set, self.phonetic_map),
+            sorted_titles_map=defaultdict(set, self.sorted_titles_map),
+            acronym_map=defaultdict(set, self.acronym_map),
+            token_index=dict(self.token_index),
+            trigram_index=dict(self.trigram_index),
+            first_char_index=list(self.first_char_index),
+            _titles=list(self._titles),
+            _title_ids=dict(self._title_ids),
+            _word_ids=dict(self._word_ids),
+            _title_tuples=set(self._title_tuples),
+            meta_by_id=list(self.meta_by_id),
+            len_by_id=array("I", self.len_by_id),
+        )
+        clone.add_title(raw_title, _copy_buckets=True)
+        return clone
 
     def extend(self, titles: Iterable[str]) -> None:
-        for title in titles:
-            self.add_title(title)
+        titles = list(titles)
+        if not titles:
+            return
+
+        # Batch both derivations once up front and hand the results to
+        # add_title, so the per-title path neither re-sanitizes nor touches
+        # the request-time caches.
+        sanitized = _sanitize_batch(titles)
+        metaphones = _metaphone_batch(sanitized)
+
+        for title, normalized, metaphone in zip(titles, sanitized, metaphones):
+            self.add_title(title, _metaphone=metaphone, _normalized=normalized)
+
+    @property
+    def title_count(self) -> int:
+        return len(self.existing_titles)
+
+    def metaphone_for(self, normalized_title: str) -> str:
+        title_id = self._title_ids.get(normalized_title)
+        if title_id is not None:
+            return self.meta_by_id[title_id]
+        return _metaphone_cached(normalized_title)
 
     def display_title(self, normalized_title: str) -> str:
         candidates = self.canonical_titles.get(normalized_title)
         if not candidates:
             return normalized_title.title()
-        return sorted(candidates)[0]
+        # min() is the O(n) way to pick the first spelling variant; sorting
+        # the whole bucket just to take element zero was wasted work.
+        return min(candidates)
 
     def _candidate_titles(self, clean_title: str, max_candidates: int = 700) -> Set[str]:
-        score_counter: Counter[str] = Counter()
         words = clean_title.split()
-
-        for token in set(words):
-            for candidate in self.token_index.get(token, ()):
-                score_counter[candidate] += 3
-
-        for gram in char_ngrams(clean_title):
-            for candidate in self.trigram_index.get(gram, ()):
-                score_counter[candidate] += 1
-
-        if clean_title:
-            for candidate in self.first_char_index.get(clean_title[0], ()):
-                if abs(len(candidate) - len(clean_title)) <= 8:
-                    score_counter[candidate] += 1
-
-        if not score_counter:
+        titles = self._titles
+        if not titles:
             return set()
+        query_len = len(clean_title)
+
+        # Posting lists are handed to the compiled scatter-add kernel in one
+        # batch rather than looped over in Python.
+        scores = np.zeros(len(titles), dtype=np.int16)
+
+        tokens = sorted(
+            set(words), key=lambda token: len(self.token_index.get(token, ()))
+        )[: self.MAX_QUERY_TOKENS]
+        token_postings = [
+            postings.to_array()
+            for postings in (self.token_index.get(token) for token in tokens)
+            if postings
+        ]
+        accumulate_postings(scores, token_postings, [3] * len(token_postings))
+
+        # When the token pass alone has filled the pool twice over, the
+        # trigram walk can only reshuffle the tail of the ranking; skip it.
+        # The cheap first-char/length pass still runs so near-length typo
+        # candidates with no token overlap stay reachable. Short queries
+        # take this walk too: their one or two degenerate grams match every
+        # title containing the query as a substring (e.g. "ndt" vs "NDTV"),
+        # which no other stage covers.
+        if np.count_nonzero(scores) < max_candidates * 2:
+            grams = sorted(
+                char_ngrams(clean_title),
+                key=lambda gram: len(self.trigram_index.get(gram, ())),
+            )[: self.MAX_QUERY_TRIGRAMS]
+            gram_postings = [
+                postings.to_array()
+                for postings in (self.trigram_index.get(gram) for gram in grams)
+                if postings
+            ]
+            accumulate_postings(scores, gram_postings, [1] * len(gram_postings))
 
-        return {candidate for candidate, _ in score_counter.most_common(max_candidates)}
+        if clean_title:
+            bucket = self.first_char_index[_char_slot(clean_title[0])]
+            if bucket:
+                candidates = np.fromiter(bucket, dtype=np.int64, count=len(bucket))
+                lengths = np.frombuffer(self.len_by_id, dtype=np.uint32)
+                close = candidates[
+                    np.abs(lengths[candidates].astype(np.int64) - query_len) <= 8
+                ]
+                scores[close] += 1
+
+        hits = np.nonzero(scores)[0]
+        if hits.size <= max_candidates:
+            return {titles[candidate] for candidate in hits}
+
+        top = hits[np.argpartition(scores[hits], -max_candidates)[-max_candidates:]]
+        return {titles[candidate] for candidate in top}
 
     def _detect_combination(self, clean_title: str) -> Optional[List[str]]:
+        """Find a way to split the title into existing titles, if any.
+
+        Simple O(n^2) reachability DP over word boundaries: pred[end]
+        records the start of a known title reaching that boundary, so one
+        back-walk recovers a segmentation without enumerating every combo
+        the way the old recursive segmenter did. The whole-title phrase is
+        excluded, so any complete path necessarily has >= 2 segments.
+        """
         words = clean_title.split()
         total_words = len(words)
         if total_words < 2:
             return None
 
-        @lru_cache(maxsize=None)
-        def segment(start: int) -> List[List[str]]:
-            combos: List[List[str]] = []
+        # Probe with word-ID tuples; a query word outside the vocabulary maps
+        # to None and can never form part of an indexed title.
+        query_ids = tuple(self._word_ids.get(word) for word in words)
+        title_tuples = self._title_tuples
+        pred = [-1] * (total_words + 1)
+        pred[0] = 0
+        for start in range(total_words):
+            if pred[start] < 0 or query_ids[start] is None:
+                continue
             for end in range(start + 1, total_words + 1):
-                phrase = " ".join(words[start:end])
-                if phrase not in self.existing_titles or phrase == clean_title:
+                if pred[end] >= 0 or (start, end) == (0, total_words):
                     continue
+                if query_ids[start:end] in title_tuples:
+                    pred[end] = start
+            if pred[total_words] >= 0:
+                break
+        if pred[total_words] < 0:
+            return None
 
-                if end == total_words:
-                    combos.append([phrase])
-                else:
-                    for tail in segment(end):
-                        combos.append([phrase] + tail)
-            return combos
-
-        for grouping in segment(0):
-            if len(grouping) >= 2:
-                return [self.display_title(item) for item in grouping]
-        return None
+        parts: List[str] = []
+        end = total_words
+        while end > 0:
+            start = pred[end]
+            parts.append(" ".join(words[start:end]))
+            end = start
+        parts.reverse()
+        return [self.display_title(part) for part in parts]
 
     def _detect_periodicity_extension(self, clean_title: str) -> Optional[str]:
         words = clean_title.split()
@@ -180,18 +459,31 @@ class TitleIndex:
             return None
 
         stripped_words = [word for word in words if word not in ADVANCED_PERIODICITY]
-        if len(stripped_words) == len(words):
+        if not stripped_words or len(stripped_words) == len(words):
             return None
 
-        base_title = " ".join(stripped_words)
-        if base_title and base_title in self.existing_titles and base_title != clean_title:
-            return self.display_title(base_title)
-        return None
+        # Hash the word-ID tuple first; the display string is only joined on
+        # the rare membership hit.
+        stripped_ids = tuple(self._word_ids.get(word) for word in stripped_words)
+        if None in stripped_ids or stripped_ids not in self._title_tuples:
+            return None
+        return self.display_title(" ".join(stripped_words))
 
     def detect_lexical_conflicts(
         self, raw_title: str, *, precleaned: bool = False
     ) -> Tuple[List[str], float]:
         clean_title = raw_title if precleaned else sanitize_input(raw_title)
+        cached = self._conflict_cache.get(clean_title)
+        if cached is None:
+            if len(self._conflict_cache) >= _CONFLICT_CACHE_MAX:
+                self._conflict_cache.pop(next(iter(self._conflict_cache)))
+            cached = self._conflict_cache[clean_title] = self._detect_conflicts(
+                clean_title
+            )
+        reasons, score = cached
+        return list(reasons), score
+
+    def _detect_conflicts(self, clean_title: str) -> Tuple[List[str], float]:
         if not clean_title:
             return ["Title cannot be empty after normalization."], 100.0
 
@@ -205,10 +497,13 @@ class TitleIndex:
             return [exact_reason], 100.0
 
         if len(words) > 1:
-            sorted_key = " ".join(sorted(words))
-            sorted_matches = self.sorted_titles_map.get(sorted_key, set())
+            query_word_ids = [self._word_ids.get(word) for word in words]
+            sorted_matches: Set[int] = set()
+            if None not in query_word_ids:
+                sorted_key = tuple(sorted(query_word_ids))
+                sorted_matches = self.sorted_titles_map.get(sorted_key, set())
             if sorted_matches:
-                matched = next(iter(sorted_matches))
+                matched = self._titles[next(iter(sorted_matches))]
                 sorted_reason = (
                     "Word-order variation matches existing title "
                     f"'{self.display_title(matched)}'."
@@ -216,9 +511,9 @@ class TitleIndex:
                 return [sorted_reason], 99.0
 
         if len(clean_title) <= 8 and clean_title.isalpha():
-            acronym_matches = self.acronym_map.get(clean_title, set())
+            acronym_matches = self.acronym_map.get(pack_acronym(clean_title), set())
             if acronym_matches:
-                matched = next(iter(acronym_matches))
+                matched = self._titles[next(iter(acronym_matches))]
                 acronym_reason = (
                     f"Acronym collision with existing title "
                     f"'{self.display_title(matched)}'."
@@ -227,12 +522,17 @@ class TitleIndex:
 
         metaphone = _metaphone_cached(clean_title)
         if metaphone:
-            phonetic_matches = self.phonetic_map.get(metaphone, set())
-            for matched in phonetic_matches:
-                if matched == clean_title:
-                    continue
-                ratio = float(fuzz.ratio(clean_title, matched))
-                if ratio >= 60.0:
+            phonetic_matches = [
+                matched
+                for title_id in self.phonetic_map.get(metaphone, ())
+                if (matched := self._titles[title_id]) != clean_title
+            ]
+            if phonetic_matches:
+                best = process.extractOne(
+                    clean_title, phonetic_matches, scorer=fuzz.ratio, score_cutoff=60.0
+                )
+                if best is not None:
+                    matched, ratio = best[0], float(best[1])
                     return [
                         (
                             f"Phonetic conflict with '{self.display_title(matched)}' "
@@ -251,13 +551,15 @@ class TitleIndex:
 
         best_score = 0.0
         best_match = None
-        for candidate in self._candidate_titles(clean_title):
-            if candidate == clean_title:
-                continue
-            score = float(fuzz.ratio(clean_title, candidate))
-            if score > best_score:
-                best_score = score
-                best_match = candidate
+        candidates = [
+            candidate
+            for candidate in self._candidate_titles(clean_title)
+            if candidate != clean_title
+        ]
+        if candidates:
+            best = process.extractOne(clean_title, candidates, scorer=fuzz.ratio)
+            if best is not None:
+                best_match, best_score = best[0], float(best[1])
 
         if best_match and best_score >= 80.0:
             return [
@@ -279,13 +581,12 @@ def enforce_guidelines(
         return ["Title cannot be empty."]
 
     reasons: List[str] = []
-    words_set = set(words)
-    disallowed = sorted(words_set.intersection(DISALLOWED_WORDS))
+    flagged = set(words) & _FLAGGED_WORDS
+    disallowed = sorted(flagged & DISALLOWED_WORDS)
     if disallowed:
         reasons.append(f"Contains disallowed words: {', '.join(disallowed).upper()}.")
 
-    periodicity_words = words_set.intersection(ADVANCED_PERIODICITY)
-    if periodicity_words and index:
+    if flagged & ADVANCED_PERIODICITY and index:
         stripped = [word for word in words if word not in ADVANCED_PERIODICITY]
         base = " ".join(stripped)
         if base and base in index.existing_titles and base != clean_title: